@@ -1,3 +1,4 @@
 __version__ = "0.0.4"
 
 from .api_wrapper import OpynFEC
+from .aggregation import aggregate_receipts, aggregate_disbursements
@@ -0,0 +1,403 @@
+"""Local aggregation of downloaded schedule_a (receipts) and schedule_b
+(disbursements) data.
+
+The openFEC aggregate endpoints (e.g. `receipts(by_state=True)`) are precomputed by
+the server for fixed dimensions and cycles. The functions here compute the same
+groupings locally, over any subset of raw transactions, with vectorized group-bys on
+NumPy column arrays. Requires NumPy (`pip install opynfec[aggregate]`).
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+import datetime
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+Records = Union[Iterable[dict], Mapping[str, Sequence]]
+Date = Union[str, datetime.date]
+
+# Dimension name -> [(output key, raw record field, max characters kept)]
+RECEIPTS_DIMENSIONS = {
+    "state": [("state", "contributor_state", None)],
+    "size": [("size", "contribution_receipt_amount", None)],
+    "employer": [("employer", "contributor_employer", None)],
+    "occupation": [("occupation", "contributor_occupation", None)],
+    "zip": [("zip", "contributor_zip", 5), ("state", "contributor_state", None)],
+}
+DISBURSEMENTS_DIMENSIONS = {
+    "purpose": [("purpose", "disbursement_purpose_category", None)],
+    "recipient": [("recipient_name", "recipient_name", None)],
+    "recipient_id": [
+        ("recipient_id", "recipient_committee_id", None),
+        ("recipient_name", "recipient_name", None),
+    ],
+}
+
+# Lower bounds of the contribution size buckets used by the by_size endpoints. The
+# smallest bucket, 0, covers contributions of $200 and under.
+SIZE_BUCKETS = (0, 200, 500, 1000, 2000)
+
+# Stands in for a missing cycle while grouping, since cycles are kept as integers
+MISSING_CYCLE = -1
+
+# fmt: off
+STATE_NAMES = {
+    "AK": "Alaska", "AL": "Alabama", "AR": "Arkansas", "AS": "American Samoa",
+    "AZ": "Arizona", "CA": "California", "CO": "Colorado", "CT": "Connecticut",
+    "DC": "District Of Columbia", "DE": "Delaware", "FL": "Florida",
+    "GA": "Georgia", "GU": "Guam", "HI": "Hawaii", "IA": "Iowa", "ID": "Idaho",
+    "IL": "Illinois", "IN": "Indiana", "KS": "Kansas", "KY": "Kentucky",
+    "LA": "Louisiana", "MA": "Massachusetts", "MD": "Maryland", "ME": "Maine",
+    "MI": "Michigan", "MN": "Minnesota", "MO": "Missouri",
+    "MP": "Northern Mariana Islands", "MS": "Mississippi", "MT": "Montana",
+    "NC": "North Carolina", "ND": "North Dakota", "NE": "Nebraska",
+    "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico", "NV": "Nevada",
+    "NY": "New York", "OH": "Ohio", "OK": "Oklahoma", "OR": "Oregon",
+    "PA": "Pennsylvania", "PR": "Puerto Rico", "RI": "Rhode Island",
+    "SC": "South Carolina", "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas",
+    "UT": "Utah", "VA": "Virginia", "VI": "Virgin Islands", "VT": "Vermont",
+    "WA": "Washington", "WI": "Wisconsin", "WV": "West Virginia", "WY": "Wyoming",
+}
+# fmt: on
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "Local aggregation requires NumPy, install it with "
+            "`pip install opynfec[aggregate]`"
+        )
+
+
+def _to_columns(
+    records: Records, fields: Iterable[str], required: Iterable[str]
+) -> Dict[str, "np.ndarray"]:
+    """Get the values of `fields` as arrays from either a list of records or a
+    mapping of field name to column of values. Missing optional columns are filled
+    with None."""
+    if isinstance(records, Mapping):
+        for field in sorted(required):
+            if field not in records:
+                raise ValueError(f"Missing required column {field!r}")
+        columns = {
+            field: np.asarray(records[field])
+            for field in sorted(fields)
+            if field in records
+        }
+        n_rows = len(next(iter(columns.values()), ()))
+        for field, column in columns.items():
+            if len(column) != n_rows:
+                raise ValueError(
+                    f"Column {field!r} has {len(column)} values, but expected "
+                    f"{n_rows} like the other columns"
+                )
+        missing = np.full(n_rows, None, dtype=object)
+        return {field: columns.get(field, missing) for field in fields}
+    records = records if isinstance(records, list) else list(records)
+    return {
+        field: np.array([record.get(field) for record in records], dtype=object)
+        for field in fields
+    }
+
+
+def _string_column(
+    column: "np.ndarray", max_chars: Optional[int] = None
+) -> "np.ndarray":
+    """Convert a column to a fixed-width unicode array, with missing values as ""."""
+    if column.dtype == object:
+        column = np.where(np.equal(column, None), "", column)
+    column = column.astype(str if max_chars is None else f"<U{max_chars}")
+    return column
+
+
+def _number_column(
+    column: "np.ndarray", dtype: type = float, missing: float = 0
+) -> "np.ndarray":
+    """Convert a column to a numeric array, with missing values as `missing`."""
+    if column.dtype == object:
+        column = np.where(np.equal(column, None), missing, column)
+    return column.astype(dtype)
+
+
+def _parse_date(value: Date, name: str) -> datetime.date:
+    """Parse a date given as a `datetime.date`, or a string in the ISO
+    (YYYY-MM-DD, optionally with a time) or MM/DD/YYYY format."""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.datetime.fromisoformat(value).date()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.datetime.strptime(value, "%m/%d/%Y").date()
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"`{name}` should be a date or a YYYY-MM-DD or MM/DD/YYYY string, but got "
+            f"{value!r}"
+        ) from None
+
+
+def _group_by(
+    keys: List["np.ndarray"], amounts: "np.ndarray"
+) -> Tuple[List["np.ndarray"], "np.ndarray", "np.ndarray"]:
+    """Vectorized group-by-sum over several key columns.
+
+    Each key column is factorized into integer codes, the codes are combined into a
+    single group code (re-compacting after each column to stay within int64), and
+    totals and counts are computed with `np.bincount`.
+    """
+    group = np.zeros(len(amounts), dtype=np.int64)
+    n_groups = 1
+    for key in keys:
+        uniques, codes = np.unique(key, return_inverse=True)
+        group = group * len(uniques) + codes.reshape(-1)
+        n_groups *= len(uniques)
+        if n_groups > len(amounts):
+            _, group = np.unique(group, return_inverse=True)
+            group = group.reshape(-1)
+            n_groups = int(group.max()) + 1 if group.size else 0
+
+    _, first, group = np.unique(group, return_index=True, return_inverse=True)
+    group = group.reshape(-1)
+    totals = np.bincount(group, weights=amounts, minlength=len(first))
+    counts = np.bincount(group, minlength=len(first))
+    return [key[first] for key in keys], totals, counts
+
+
+def _aggregate(
+    records: Records,
+    by: Union[str, Sequence[str]],
+    dimensions: Dict[str, list],
+    amount_field: str,
+    date_field: str,
+    min_date: Optional[Date],
+    max_date: Optional[Date],
+    min_amount: Optional[float],
+    max_amount: Optional[float],
+    exclude_memos: bool,
+    individual_only: bool = False,
+) -> List[dict]:
+    _require_numpy()
+
+    if min_date is not None:
+        min_date = _parse_date(min_date, "min_date")
+    if max_date is not None:
+        max_date = _parse_date(max_date, "max_date")
+
+    by = (by,) if isinstance(by, str) else tuple(by)
+    if not by:
+        raise ValueError("`by` must contain at least one dimension")
+    for dimension in by:
+        if dimension not in dimensions:
+            raise ValueError(
+                f"`by` should only contain {set(dimensions)}, but got {dimension!r}"
+            )
+
+    # Build the output keys, skipping any that are repeated between dimensions
+    outputs = [("committee_id", "committee_id", None)]
+    outputs.append(("cycle", "two_year_transaction_period", None))
+    for dimension in by:
+        for output in dimensions[dimension]:
+            if output[0] not in {o[0] for o in outputs}:
+                outputs.append(output)
+
+    required = {"committee_id", "two_year_transaction_period", amount_field}
+    if min_date is not None or max_date is not None:
+        required.add(date_field)
+    if individual_only:
+        required.add("is_individual")
+    fields = {field for _, field, _ in outputs} | required
+    if exclude_memos:
+        fields.add("memo_code")
+    columns = _to_columns(records, fields, required)
+
+    amounts = _number_column(columns[amount_field])
+    mask = np.ones(len(amounts), dtype=bool)
+    if min_amount is not None:
+        mask &= amounts >= min_amount
+    if max_amount is not None:
+        mask &= amounts <= max_amount
+    if min_date is not None or max_date is not None:
+        dates = _string_column(columns[date_field], max_chars=10)
+        if min_date is not None:
+            mask &= dates >= min_date.isoformat()
+        if max_date is not None:
+            mask &= dates <= max_date.isoformat()
+        mask &= dates != ""
+    if exclude_memos:
+        mask &= _string_column(columns["memo_code"]) != "X"
+    if individual_only:
+        mask &= _number_column(columns["is_individual"], bool)
+
+    amounts = amounts[mask]
+    keys = []
+    for output_key, field, max_chars in outputs:
+        if output_key == "size":
+            buckets = np.array(SIZE_BUCKETS)
+            # A contribution of exactly $200 falls in the lowest bucket
+            index = np.searchsorted(buckets, amounts, side="right") - 1
+            index[amounts == 200] = 0
+            keys.append(buckets[np.clip(index, 0, None)])
+        elif output_key == "cycle":
+            keys.append(
+                _number_column(columns[field][mask], np.int64, missing=MISSING_CYCLE)
+            )
+        else:
+            keys.append(_string_column(columns[field][mask], max_chars))
+
+    key_values, totals, counts = _group_by(keys, amounts)
+
+    results = []
+    for i in range(len(totals)):
+        result = {}
+        for (output_key, _, _), values in zip(outputs, key_values):
+            value = values[i].item()
+            result[output_key] = None if value in ("", MISSING_CYCLE) else value
+            if output_key == "state":
+                result["state_full"] = STATE_NAMES.get(value)
+        result["total"] = round(totals[i].item(), 2)
+        result["count"] = counts[i].item()
+        results.append(result)
+    return results
+
+
+def aggregate_receipts(
+    records: Records,
+    by: Union[str, Sequence[str]],
+    min_date: Optional[Date] = None,
+    max_date: Optional[Date] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    exclude_memos: bool = True,
+    individual_only: bool = True,
+) -> List[dict]:
+    """Aggregate raw schedule_a receipts locally, like `OpynFEC.receipts()` does with
+    `by_state`, `by_size`, `by_employer`, `by_occupation` or `by_zip`.
+
+    Results are grouped by committee and cycle, as well as every dimension in `by`,
+    and are returned in the same shape as the corresponding openFEC endpoint, e.g.
+    `{"committee_id", "cycle", "state", "state_full", "total", "count"}` for
+    `by="state"`. By default, only individual contributions that are not memo entries
+    are counted, as the server does. Unlike the server aggregates, any date window,
+    amount band or combination of dimensions can be used.
+
+    Parameters
+    ----------
+    records : Union[Iterable[dict], Mapping[str, Sequence]]
+        Raw schedule_a results (e.g. from `OpynFEC.receipts()`), or a mapping of field
+        name to column of values for the same fields.
+    by : Union[str, Sequence[str]]
+        Dimension(s) to group by, from {'state', 'size', 'employer', 'occupation',
+        'zip'}.
+    min_date : Optional[Union[str, datetime.date]], optional
+        Only include receipts on or after this date, given as a date or a
+        YYYY-MM-DD or MM/DD/YYYY string, by default None.
+    max_date : Optional[Union[str, datetime.date]], optional
+        Only include receipts on or before this date, in the same formats as
+        `min_date`, by default None.
+    min_amount : Optional[float], optional
+        Only include receipts of at least this amount, by default None.
+    max_amount : Optional[float], optional
+        Only include receipts of at most this amount, by default None.
+    exclude_memos : bool, optional
+        Whether to leave out memo entries (memo_code "X"), which are already counted
+        elsewhere, by default True.
+    individual_only : bool, optional
+        Whether to only include contributions from individuals (`is_individual`),
+        rather than all receipt types such as PAC contributions and party transfers,
+        by default True.
+
+    Returns
+    -------
+    results : List[dict]
+        One result per group.
+
+    Raises
+    ------
+    ValueError
+        If `by` is empty or contains an unknown dimension, if `min_date` or
+        `max_date` cannot be parsed, or if `records` is a mapping of columns that is
+        missing a column needed for the aggregation.
+    ImportError
+        If NumPy is not installed.
+    """
+    return _aggregate(
+        records,
+        by,
+        RECEIPTS_DIMENSIONS,
+        amount_field="contribution_receipt_amount",
+        date_field="contribution_receipt_date",
+        min_date=min_date,
+        max_date=max_date,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        exclude_memos=exclude_memos,
+        individual_only=individual_only,
+    )
+
+
+def aggregate_disbursements(
+    records: Records,
+    by: Union[str, Sequence[str]],
+    min_date: Optional[Date] = None,
+    max_date: Optional[Date] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    exclude_memos: bool = True,
+) -> List[dict]:
+    """Aggregate raw schedule_b disbursements locally, like `OpynFEC.disbursements()`
+    does with `by_purpose`, `by_recipient` or `by_recipient_id`.
+
+    See `aggregate_receipts()` for details.
+
+    Parameters
+    ----------
+    records : Union[Iterable[dict], Mapping[str, Sequence]]
+        Raw schedule_b results (e.g. from `OpynFEC.disbursements()`), or a mapping of
+        field name to column of values for the same fields.
+    by : Union[str, Sequence[str]]
+        Dimension(s) to group by, from {'purpose', 'recipient', 'recipient_id'}.
+    min_date : Optional[Union[str, datetime.date]], optional
+        Only include disbursements on or after this date, given as a date or a
+        YYYY-MM-DD or MM/DD/YYYY string, by default None.
+    max_date : Optional[Union[str, datetime.date]], optional
+        Only include disbursements on or before this date, in the same formats as
+        `min_date`, by default None.
+    min_amount : Optional[float], optional
+        Only include disbursements of at least this amount, by default None.
+    max_amount : Optional[float], optional
+        Only include disbursements of at most this amount, by default None.
+    exclude_memos : bool, optional
+        Whether to leave out memo entries (memo_code "X"), by default True.
+
+    Returns
+    -------
+    results : List[dict]
+        One result per group.
+
+    Raises
+    ------
+    ValueError
+        If `by` is empty or contains an unknown dimension, if `min_date` or
+        `max_date` cannot be parsed, or if `records` is a mapping of columns that is
+        missing a column needed for the aggregation.
+    ImportError
+        If NumPy is not installed.
+    """
+    return _aggregate(
+        records,
+        by,
+        DISBURSEMENTS_DIMENSIONS,
+        amount_field="disbursement_amount",
+        date_field="disbursement_date",
+        min_date=min_date,
+        max_date=max_date,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        exclude_memos=exclude_memos,
+    )
@@ -1,14 +1,54 @@
-from typing import List, Dict, Union, Optional
+from collections import OrderedDict
+from typing import Any, Iterable, Iterator, List, Dict, Tuple, Union, Optional
+import itertools
 import math
 import urllib.parse
 import requests
 
 
+class _DimensionTable:
+    """Bounded, least-recently-used lookup table of dimension records keyed by ID.
+
+    IDs that the API could not resolve are stored as None so they are not requested
+    again.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._table = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._table
+
+    def get(self, key: str) -> Optional[dict]:
+        value = self._table.get(key)
+        if key in self._table:
+            self._table.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Optional[dict]) -> None:
+        self._table[key] = value
+        self._table.move_to_end(key)
+        while len(self._table) > self.max_size:
+            self._table.popitem(last=False)
+
+
 class OpynFEC:
     BASE_URL = "https://api.open.fec.gov/v1/"
 
-    def __init__(self, api_key: str):
+    # Maps an enrichment dimension to its foreign key and the bulk endpoint used to
+    # resolve it. Both endpoints accept a list of IDs for the foreign key parameter.
+    DIMENSIONS = {
+        "committee": ("committee_id", "committees"),
+        "candidate": ("candidate_id", "candidates"),
+    }
+
+    def __init__(self, api_key: str, dimension_table_size: int = 100_000):
         self.api_key = api_key
+        self._dimension_tables = {
+            dimension: _DimensionTable(dimension_table_size)
+            for dimension in self.DIMENSIONS
+        }
 
     def _get_request(self, endpoint: str, **kwargs) -> dict:
         """General method for making a GET request to the API.
@@ -439,3 +479,91 @@ class OpynFEC:
         return self._get_unpaginated_request(
             endpoint, call_limit=call_limit, result_limit=result_limit, **kwargs
         )
+
+    def _resolve_dimension(self, dimension: str, ids: Iterable[str]) -> Dict[str, Any]:
+        """Look up `ids` for `dimension`, fetching any that are not yet memoized in
+        bulk requests of up to 100 IDs each."""
+        key, endpoint = self.DIMENSIONS[dimension]
+        table = self._dimension_tables[dimension]
+
+        ids = set(ids)
+        resolved = {id_: table.get(id_) for id_ in ids if id_ in table}
+        missing = sorted(ids - resolved.keys())
+        for start in range(0, len(missing), 100):
+            chunk = missing[start : start + 100]
+            fetched = {id_: None for id_ in chunk}
+            for result in self._get_unpaginated_request(endpoint, **{key: chunk}):
+                if result.get(key) in fetched:
+                    fetched[result[key]] = result
+            for id_, result in fetched.items():
+                table.put(id_, result)
+            resolved.update(fetched)
+
+        return resolved
+
+    def enrich(
+        self,
+        records: Iterable[dict],
+        dimensions: Union[str, Iterable[str]] = ("committee", "candidate"),
+        batch_size: int = 1000,
+    ) -> Iterator[dict]:
+        """Attach committee and/or candidate details to a stream of records.
+
+        Records are consumed `batch_size` at a time. The distinct foreign keys of each
+        batch are resolved with bulk `committees()`/`candidates()` requests, and the
+        results are memoized in a bounded dimension table shared across calls, so each
+        ID is generally only requested once. The details are added to each record
+        under `"<dimension>_details"` (None if the record has no ID or the ID could
+        not be found).
+
+        Parameters
+        ----------
+        records : Iterable[dict]
+            Records with `committee_id` and/or `candidate_id` keys, such as the results
+            of `receipts()` or `disbursements()`.
+        dimensions : Union[str, Iterable[str]], optional
+            Which of {'committee', 'candidate'} to attach, by default both.
+        batch_size : int, optional
+            Number of records to read before resolving their foreign keys, by default
+            1000.
+
+        Returns
+        -------
+        records : Iterator[dict]
+            Each input record, enriched in place, produced lazily.
+
+        Raises
+        ------
+        ValueError
+            If any of `dimensions` is not one of {'committee', 'candidate'}, or if
+            `batch_size` is less than 1.
+        """
+        if batch_size < 1:
+            raise ValueError(f"`batch_size` must be at least 1, but got {batch_size}")
+
+        dimensions = (dimensions,) if isinstance(dimensions, str) else tuple(dimensions)
+        for dimension in dimensions:
+            if dimension not in self.DIMENSIONS:
+                raise ValueError(
+                    "`dimensions` should only contain 'committee' or 'candidate', but "
+                    f"got {dimension!r}"
+                )
+
+        return self._enrich_batches(iter(records), dimensions, batch_size)
+
+    def _enrich_batches(
+        self, records: Iterator[dict], dimensions: Tuple[str, ...], batch_size: int
+    ) -> Iterator[dict]:
+        while True:
+            batch = list(itertools.islice(records, batch_size))
+            if not batch:
+                return
+
+            for dimension in dimensions:
+                key = self.DIMENSIONS[dimension][0]
+                ids = {record[key] for record in batch if record.get(key)}
+                resolved = self._resolve_dimension(dimension, ids)
+                for record in batch:
+                    record[f"{dimension}_details"] = resolved.get(record.get(key))
+
+            yield from batch
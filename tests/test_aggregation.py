@@ -0,0 +1,201 @@
+import datetime
+import unittest
+from src.opynfec import aggregate_receipts, aggregate_disbursements
+
+
+RECEIPTS = [
+    {
+        "committee_id": "C00401224",
+        "two_year_transaction_period": 2020,
+        "contributor_state": "CT",
+        "contributor_zip": "065111234",
+        "contributor_employer": "SELF",
+        "contribution_receipt_amount": 200,
+        "contribution_receipt_date": "2020-01-15T00:00:00",
+        "memo_code": None,
+        "is_individual": True,
+    },
+    {
+        "committee_id": "C00401224",
+        "two_year_transaction_period": 2020,
+        "contributor_state": "CT",
+        "contributor_zip": "06511",
+        "contributor_employer": "RETIRED",
+        "contribution_receipt_amount": 250.5,
+        "contribution_receipt_date": "2020-03-01T00:00:00",
+        "memo_code": None,
+        "is_individual": True,
+    },
+    {
+        "committee_id": "C00401224",
+        "two_year_transaction_period": 2020,
+        "contributor_state": "NY",
+        "contributor_zip": "10001",
+        "contributor_employer": None,
+        "contribution_receipt_amount": 2800,
+        "contribution_receipt_date": "2020-06-30T00:00:00",
+        "memo_code": None,
+        "is_individual": True,
+    },
+    {
+        "committee_id": "C00401224",
+        "two_year_transaction_period": 2020,
+        "contributor_state": "NY",
+        "contributor_zip": "10001",
+        "contributor_employer": None,
+        "contribution_receipt_amount": 2800,
+        "contribution_receipt_date": "2020-06-30T00:00:00",
+        "memo_code": "X",
+        "is_individual": True,
+    },
+    {
+        "committee_id": "C00401224",
+        "two_year_transaction_period": 2020,
+        "contributor_state": "CT",
+        "contributor_zip": "06511",
+        "contributor_employer": None,
+        "contribution_receipt_amount": 5000,
+        "contribution_receipt_date": "2020-04-01T00:00:00",
+        "memo_code": None,
+        "is_individual": False,
+    },
+]
+
+
+class TestAggregateReceipts(unittest.TestCase):
+    def test_by_state(self):
+        res = aggregate_receipts(RECEIPTS, by="state")
+        self.assertEqual(
+            res,
+            [
+                {
+                    "committee_id": "C00401224",
+                    "cycle": 2020,
+                    "state": "CT",
+                    "state_full": "Connecticut",
+                    "total": 450.5,
+                    "count": 2,
+                },
+                {
+                    "committee_id": "C00401224",
+                    "cycle": 2020,
+                    "state": "NY",
+                    "state_full": "New York",
+                    "total": 2800.0,
+                    "count": 1,
+                },
+            ],
+            "Aggregate by state not as expected",
+        )
+
+    def test_by_size(self):
+        res = aggregate_receipts(RECEIPTS, by="size")
+        self.assertEqual(
+            [(r["size"], r["total"], r["count"]) for r in res],
+            [(0, 200.0, 1), (200, 250.5, 1), (2000, 2800.0, 1)],
+            "Aggregate by size not as expected",
+        )
+
+    def test_by_zip(self):
+        res = aggregate_receipts(RECEIPTS, by="zip")
+        self.assertEqual(
+            [(r["zip"], r["state"], r["count"]) for r in res],
+            [("06511", "CT", 2), ("10001", "NY", 1)],
+            "Aggregate by zip not as expected",
+        )
+
+    def test_combined_with_filters(self):
+        res = aggregate_receipts(
+            RECEIPTS, by=["state", "employer"], min_date="2020-02-01", min_amount=250
+        )
+        self.assertEqual(
+            [(r["state"], r["employer"], r["total"]) for r in res],
+            [("CT", "RETIRED", 250.5), ("NY", None, 2800.0)],
+            "Filtered aggregate not as expected",
+        )
+
+    def test_columns(self):
+        columns = {
+            field: [record[field] for record in RECEIPTS] for field in RECEIPTS[0]
+        }
+        self.assertEqual(
+            aggregate_receipts(columns, by="employer"),
+            aggregate_receipts(RECEIPTS, by="employer"),
+            "Aggregate of columns does not match aggregate of records",
+        )
+
+    def test_columns_length_mismatch(self):
+        columns = {
+            field: [record[field] for record in RECEIPTS] for field in RECEIPTS[0]
+        }
+        columns["contributor_state"] = columns["contributor_state"][:-1]
+        with self.assertRaisesRegex(ValueError, "contributor_state"):
+            aggregate_receipts(columns, by="state")
+
+    def test_all_receipt_types(self):
+        res = aggregate_receipts(RECEIPTS, by="state", individual_only=False)
+        self.assertEqual(
+            [(r["state"], r["total"], r["count"]) for r in res],
+            [("CT", 5450.5, 3), ("NY", 2800.0, 1)],
+            "Aggregate of all receipt types not as expected",
+        )
+
+    def test_columns_missing_required(self):
+        columns = {
+            field: [record[field] for record in RECEIPTS] for field in RECEIPTS[0]
+        }
+        for field in ("contribution_receipt_amount", "contribution_receipt_date"):
+            partial = {k: v for k, v in columns.items() if k != field}
+            with self.assertRaisesRegex(ValueError, field):
+                aggregate_receipts(partial, by="state", min_date="2020-01-01")
+
+    def test_date_formats(self):
+        expected = aggregate_receipts(RECEIPTS, by="state", min_date="2020-03-01")
+        for min_date in ("03/01/2020", datetime.date(2020, 3, 1)):
+            self.assertEqual(
+                aggregate_receipts(RECEIPTS, by="state", min_date=min_date),
+                expected,
+                f"Aggregate with min_date {min_date!r} not as expected",
+            )
+        with self.assertRaises(ValueError):
+            aggregate_receipts(RECEIPTS, by="state", max_date="March 1, 2020")
+
+    def test_bad_dimension(self):
+        with self.assertRaises(ValueError):
+            aggregate_receipts(RECEIPTS, by="purpose")
+
+    def test_missing_cycle(self):
+        records = [dict(RECEIPTS[0], two_year_transaction_period=None), RECEIPTS[1]]
+        res = aggregate_receipts(records, by="state")
+        self.assertEqual(
+            [(r["cycle"], r["count"]) for r in res],
+            [(None, 1), (2020, 1)],
+            "Missing cycle not aggregated as None",
+        )
+
+
+class TestAggregateDisbursements(unittest.TestCase):
+    def test_by_purpose(self):
+        records = [
+            {
+                "committee_id": "C00401224",
+                "two_year_transaction_period": 2020,
+                "disbursement_purpose_category": "ADVERTISING",
+                "disbursement_amount": amount,
+            }
+            for amount in (100, 50.25)
+        ]
+        res = aggregate_disbursements(records, by="purpose")
+        self.assertEqual(
+            res,
+            [
+                {
+                    "committee_id": "C00401224",
+                    "cycle": 2020,
+                    "purpose": "ADVERTISING",
+                    "total": 150.25,
+                    "count": 2,
+                }
+            ],
+            "Aggregate by purpose not as expected",
+        )
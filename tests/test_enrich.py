@@ -0,0 +1,108 @@
+import unittest
+from src.opynfec import OpynFEC
+from src.opynfec.api_wrapper import _DimensionTable
+
+
+class TestDimensionTable(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        table = _DimensionTable(max_size=2)
+        table.put("a", {"id": "a"})
+        table.put("b", None)
+        table.get("a")
+        table.put("c", {"id": "c"})
+        self.assertIn("a", table, "Recently used entry was evicted")
+        self.assertNotIn("b", table, "Least recently used entry was not evicted")
+        self.assertIn("c", table, "New entry was not stored")
+
+    def test_stores_unresolved(self):
+        table = _DimensionTable(max_size=2)
+        table.put("a", None)
+        self.assertIn("a", table, "Unresolved entry was not stored")
+        self.assertIsNone(table.get("a"), "Unresolved entry not stored as None")
+
+
+class TestEnrichOffline(unittest.TestCase):
+    def setUp(self) -> None:
+        self.api_wrapper = OpynFEC(api_key="DEMO_KEY")
+        self.calls = []
+
+        def get_unpaginated_request(endpoint, **kwargs):
+            key = "committee_id" if endpoint == "committees" else "candidate_id"
+            self.calls.append((endpoint, kwargs[key]))
+            return [{key: id_} for id_ in kwargs[key] if not id_.startswith("BAD")]
+
+        self.api_wrapper._get_unpaginated_request = get_unpaginated_request
+
+    def test_bulk_requests(self):
+        records = [{"committee_id": f"C{i % 150}"} for i in range(1000)]
+        res = list(self.api_wrapper.enrich(records, dimensions=["committee"]))
+        self.assertEqual(len(res), 1000, "Enrich did not return every record")
+        self.assertEqual(
+            [len(ids) for _, ids in self.calls],
+            [100, 50],
+            "Distinct IDs not requested in bulk chunks of 100",
+        )
+        self.assertEqual(
+            res[151]["committee_details"], {"committee_id": "C1"}, "Wrong details"
+        )
+
+    def test_memoized(self):
+        records = [
+            {"committee_id": "C1", "candidate_id": "BAD1"},
+            {"committee_id": "C2", "candidate_id": "P1"},
+            {"committee_id": "C1", "candidate_id": None},
+        ]
+        res = list(self.api_wrapper.enrich(records, batch_size=2))
+        list(self.api_wrapper.enrich([dict(r) for r in records], batch_size=2))
+        self.assertEqual(
+            self.calls,
+            [
+                ("committees", ["C1", "C2"]),
+                ("candidates", ["BAD1", "P1"]),
+            ],
+            "Memoized IDs were requested again",
+        )
+        self.assertIsNone(res[0]["candidate_details"], "Unresolved ID got details")
+        self.assertIsNone(res[2]["candidate_details"], "Missing ID got details")
+
+    def test_single_dimension(self):
+        res = list(self.api_wrapper.enrich([{"committee_id": "C1"}], "committee"))
+        self.assertEqual(
+            res[0]["committee_details"], {"committee_id": "C1"}, "Wrong details"
+        )
+        self.assertNotIn("candidate_details", res[0], "Unrequested dimension added")
+
+    def test_bad_dimension(self):
+        with self.assertRaises(ValueError):
+            self.api_wrapper.enrich([], dimensions=["filing"])
+
+    def test_bad_batch_size(self):
+        for batch_size in (0, -1):
+            with self.assertRaises(ValueError):
+                self.api_wrapper.enrich([{"committee_id": "C1"}], batch_size=batch_size)
+
+
+class TestEnrich(unittest.TestCase):
+    def setUp(self) -> None:
+        self.api_wrapper = OpynFEC(api_key="DEMO_KEY")
+
+    def test_enrich(self):
+        records = [
+            {"committee_id": "C00401224", "candidate_id": "S0CT00177"},
+            {"committee_id": "C00401224", "candidate_id": None},
+        ]
+        res = list(self.api_wrapper.enrich(records, batch_size=1))
+        self.assertEqual(len(res), 2, "Enrich did not return every record")
+        self.assertEqual(
+            res[0]["committee_details"]["committee_id"],
+            "C00401224",
+            "Committee details not as expected",
+        )
+        self.assertEqual(
+            res[0]["candidate_details"]["name"],
+            "BLUMENTHAL, RICHARD",
+            "Candidate details not as expected",
+        )
+        self.assertIsNone(
+            res[1]["candidate_details"], "Record without ID was given details"
+        )